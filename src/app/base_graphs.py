@@ -2,8 +2,28 @@
 Base graph functions for xyz
 '''
 
+from functools import lru_cache
+
+import numpy as np
 import pandas as pd
-from plotly.graph_objects import Figure
+from plotly.graph_objects import Figure, Layout, Scatter, Scattergl
+
+from app.cache import get_column_stats, get_dataframe
+from app.dashboard_logic import filter_dataframe
+
+# Above this many points scatter traces are drawn with WebGL (Scattergl) instead of SVG
+WEBGL_POINT_THRESHOLD = 10_000
+
+# Layout shared by every chart, built once at import rather than on every figure build.
+# It holds no template, so each new figure takes the default active when it is built
+# (e.g. the Bootstrap theme loaded by app_factory) rather than the one at import
+_AXIS_STYLE = dict(showline=True, linewidth=0.5, linecolor='lightgrey', mirror=True)
+
+_BASE_LAYOUT = Layout(margin=dict(l=20, r=20, t=40, b=20),
+                      paper_bgcolor='rgba(0,0,0,0)',
+                      plot_bgcolor='rgba(0,0,0,0)',
+                      xaxis=_AXIS_STYLE,
+                      yaxis={**_AXIS_STYLE, 'rangemode': 'tozero'})
 
 
 def create_chart(df: pd.DataFrame) -> Figure:
@@ -19,6 +39,308 @@ def create_chart(df: pd.DataFrame) -> Figure:
         Figure: A Plotly Figure object representing the scatter plot with trendlines.
     '''
 
-    fig = # run some logic
+    fig = create_base_figure()
+
+    # add traces here, e.g. add_grouped_traces(fig, df, x=..., y=..., group=...)
+
+    return fig
+
+
+def create_base_figure() -> Figure:
+    '''
+    Returns a new, empty figure with the shared chart layout already applied.
+
+    Only the traces and any per-chart settings such as axis ranges need to be
+    added, saving the repeated update_layout / update_xaxes / update_yaxes calls.
+
+    Returns:
+        Figure: An empty Plotly Figure using a copy of the shared layout.
+    '''
+
+    return Figure(layout=_BASE_LAYOUT)
+
+
+def column_max(df: pd.DataFrame, column: str) -> float:
+    '''
+    Returns the maximum of a column, using the precomputed value for registered data.
+
+    When df is the registered DataFrame (from get_dataframe), the maximum comes from
+    get_column_stats instead of rescanning the column. Pass the registered frame
+    rather than a filtered copy to keep axis ranges stable across selections.
+
+    Args:
+        df (pd.DataFrame): DataFrame containing the column.
+        column (str): Name of the column.
+
+    Returns:
+        float: The column maximum.
+    '''
+
+    precomputed = (get_column_stats(df) or {}).get('column_max', {})
+
+    if column in precomputed:
+        return precomputed[column]
+
+    return df[column].max()
+
+
+def y_axis_upper_bound(peak: float, padding: float = 1.35, step: int = 200) -> int:
+    '''
+    Pads a peak value and rounds it up to the next multiple of step, for use as
+    the upper y axis range so labels and annotations have headroom.
+
+    Args:
+        peak (float): The largest value plotted, e.g. from column_max.
+        padding (float): Multiplier applied to the peak. Defaults to 1.35.
+        step (int): The bound is rounded up to a multiple of this. Defaults to 200.
+
+    Returns:
+        int: The padded, rounded upper bound.
+    '''
+
+    # Floor division of the negated value is a ceil division without math.ceil
+    return int(-(-(peak * padding) // step) * step)
+
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    '''
+    Trailing rolling mean using a running sum, without a per-window Python loop.
+
+    Each point averages the non-missing values in its window, and the first
+    window - 1 points average over the values seen so far, matching pandas
+    rolling(window, min_periods=1).mean(). Windows holding only NaN give NaN.
+
+    Args:
+        values (np.ndarray): 1-D array of values ordered along the x axis.
+        window (int): Number of points in each window.
+
+    Returns:
+        np.ndarray: Array of rolling means, the same length as values.
+
+    Raises:
+        ValueError: If window is less than 1.
+    '''
+
+    if window < 1:
+        raise ValueError(f"window must be at least 1, got {window}")
+
+    values = np.asarray(values, dtype=np.float64)
+    present = ~np.isnan(values)
+
+    # Sum and count only the present values, so a NaN does not spread to later windows
+    running_sum = np.cumsum(np.where(present, values, 0.0))
+    running_count = np.cumsum(present)
+
+    window_sum = running_sum.copy()
+    window_sum[window:] -= running_sum[:-window]
+    window_count = running_count.copy()
+    window_count[window:] -= running_count[:-window]
+
+    with np.errstate(invalid='ignore'):
+        return window_sum / window_count
+
+
+def add_grouped_traces(fig: Figure,
+                       df: pd.DataFrame,
+                       x: str,
+                       y: str,
+                       group: str,
+                       trace_type: type = Scatter,
+                       hover_columns: list[str] = None,
+                       **trace_kwargs) -> Figure:
+    '''
+    Adds one graph_objects trace per group to an existing figure.
+
+    Building traces directly skips the DataFrame copying, dtype inference and
+    per-colour reshaping that plotly express runs on every call.
+
+    Args:
+        fig (Figure): The figure to add the traces to.
+        df (pd.DataFrame): DataFrame containing the x, y and group columns.
+        x (str): Column plotted on the x axis.
+        y (str): Column plotted on the y axis.
+        group (str): Column identifying each trace, e.g. the px color column.
+        trace_type (type): graph_objects trace class, e.g. Scatter, Violin or Bar.
+            Defaults to Scatter, which is swapped for Scattergl when df has more
+            than WEBGL_POINT_THRESHOLD rows.
+        hover_columns (list[str], optional): Columns passed to each trace as customdata,
+            referenced in a hovertemplate as %{customdata[0]}, %{customdata[1]}, ...
+        **trace_kwargs: Further arguments passed to every trace,
+            e.g. mode='markers' or hovertemplate.
+
+    Returns:
+        Figure: The same figure with the traces added.
+    '''
+
+    # Convert each column to an array once and slice it per group,
+    # rather than building a DataFrame and hover matrix for every trace
+    x_values = df[x].to_numpy()
+    y_values = df[y].to_numpy()
+    customdata = df[hover_columns].to_numpy(dtype=object) if hover_columns else None
+
+    if trace_type is Scatter and len(df) > WEBGL_POINT_THRESHOLD:
+        trace_type = Scattergl
+
+    for name, positions in df.groupby(group, sort=False, observed=True).indices.items():
+        if customdata is not None:
+            trace_kwargs['customdata'] = customdata[positions]
+
+        fig.add_trace(trace_type(x=x_values[positions],
+                                 y=y_values[positions],
+                                 name=str(name),
+                                 legendgroup=str(name),
+                                 **trace_kwargs))
 
     return fig
+
+
+def add_rolling_trendlines(fig: Figure,
+                           df: pd.DataFrame,
+                           x: str,
+                           y: str,
+                           group: str,
+                           window: int = 5) -> Figure:
+    '''
+    Adds one rolling mean trendline per group to an existing figure.
+
+    A faster replacement for px.scatter(..., trendline='rolling'), which runs
+    through statsmodels for every trace. Lines are drawn with Scattergl when df
+    has more than WEBGL_POINT_THRESHOLD rows.
+
+    Args:
+        fig (Figure): The figure to add the trendlines to.
+        df (pd.DataFrame): DataFrame containing the x, y and group columns.
+        x (str): Column plotted on the x axis.
+        y (str): Column the rolling mean is calculated over.
+        group (str): Column identifying each trace, e.g. the px color column.
+        window (int): Number of points in each rolling window. Defaults to 5.
+
+    Returns:
+        Figure: The same figure with the trendline traces added.
+    '''
+
+    trace_type = Scattergl if len(df) > WEBGL_POINT_THRESHOLD else Scatter
+
+    for name, group_df in df.groupby(group, sort=False, observed=True):
+        group_df = group_df.sort_values(x)
+        fig.add_trace(trace_type(x=group_df[x].to_numpy(),
+                                 y=rolling_mean(group_df[y].to_numpy(), window),
+                                 mode='lines',
+                                 name=str(name),
+                                 legendgroup=str(name),
+                                 showlegend=False))
+
+    return fig
+
+
+def create_axis_ticks(max_value: int, step: int = 7) -> tuple[list[int], list[str]]:
+    '''
+    Builds tick positions and labels for an axis shown in larger units than its data,
+    e.g. an age_in_days axis labelled in weeks.
+
+    Args:
+        max_value (int): The largest value on the axis.
+        step (int): Size of one labelled unit in data units. Defaults to 7 (days per week).
+
+    Returns:
+        tuple[list[int], list[str]]: The tickvals and ticktext for fig.update_xaxes.
+    '''
+
+    tick_values = np.arange(0, max_value + step, step, dtype=np.int64)
+    tick_labels = np.char.mod('%d', tick_values // step)
+
+    return tick_values.tolist(), tick_labels.tolist()
+
+
+def quantile_outliers(df: pd.DataFrame,
+                      group_cols: list[str],
+                      value_col: str,
+                      lower: float = 0.05,
+                      upper: float = 0.95) -> pd.DataFrame:
+    '''
+    Returns only the rows that fall outside the per-group quantile range.
+
+    Use with px.violin(..., points=False) or points='outliers' so the figure
+    ships a handful of outlier markers rather than every record to the browser.
+
+    Args:
+        df (pd.DataFrame): DataFrame containing the group and value columns.
+        group_cols (list[str]): Columns defining each violin, e.g. ['name', 'age_in_weeks'].
+        value_col (str): Column the quantiles are calculated over.
+        lower (float): Lower quantile. Defaults to 0.05.
+        upper (float): Upper quantile. Defaults to 0.95.
+
+    Returns:
+        pd.DataFrame: The outlier rows of df.
+    '''
+
+    grouped = df.groupby(group_cols, sort=False, observed=True)[value_col]
+    values = df[value_col]
+
+    is_outlier = ((values < grouped.transform('quantile', lower))
+                  | (values > grouped.transform('quantile', upper)))
+
+    return df[is_outlier]
+
+
+@lru_cache(maxsize=64)
+def get_cached_chart(df_key: str,
+                     selections: tuple = (),
+                     ranges: tuple = ()) -> Figure:
+    '''
+    Returns the chart for a registered DataFrame and set of filters,
+    building it only on the first call.
+
+    Args:
+        df_key (str): Key returned by app.cache.register_dataframe.
+        selections (tuple): Hashable form of the selections passed to filter_dataframe,
+            e.g. (('name', ('a', 'b')),).
+        ranges (tuple): Hashable form of the ranges passed to filter_dataframe,
+            e.g. (('age_in_weeks', (0, 12)),).
+
+    Returns:
+        Figure: The cached Plotly Figure. The same object is returned on every
+            call, so copy it with go.Figure(fig) before making any changes.
+    '''
+
+    df = filter_dataframe(get_dataframe(df_key), dict(selections), dict(ranges))
+
+    return create_chart(df)
+
+
+@lru_cache(maxsize=32)
+def get_cached_group_totals(df_key: str,
+                            group_cols: tuple[str, ...],
+                            value_col: str,
+                            selections: tuple = (),
+                            ranges: tuple = ()) -> pd.DataFrame:
+    '''
+    Sums a column per group for a registered DataFrame and set of filters,
+    e.g. for a stacked bar chart, running the groupby only once per unique set of arguments.
+
+    Args:
+        df_key (str): Key returned by app.cache.register_dataframe.
+        group_cols (tuple[str, ...]): Columns to group by. The first column is the
+            bar axis, e.g. ('age_in_weeks', 'night_or_day').
+        value_col (str): Column to sum.
+        selections (tuple): Hashable form of the selections passed to filter_dataframe,
+            e.g. (('name', ('a', 'b')),).
+        ranges (tuple): Hashable form of the ranges passed to filter_dataframe,
+            e.g. (('age_in_weeks', (0, 12)),).
+
+    Returns:
+        pd.DataFrame: One row per group with the summed value_col and a 'share_label'
+            column giving each row's percentage of its group_cols[0] total.
+            The cached DataFrame is shared between calls and must not be modified.
+    '''
+
+    df = filter_dataframe(get_dataframe(df_key), dict(selections), dict(ranges))
+
+    # observed=True skips empty combinations of unused categorical levels
+    totals = df.groupby(list(group_cols), observed=True, sort=False, as_index=False).agg(
+        **{value_col: (value_col, 'sum')})
+
+    axis_totals = totals.groupby(group_cols[0], observed=True, sort=False)[value_col].transform('sum')
+    totals['share_label'] = (totals[value_col] / axis_totals * 100).round(1).astype(str) + '%'
+
+    return totals
@@ -0,0 +1,136 @@
+'''
+Server side cache shared by the Dash app and its callbacks,
+holding the source DataFrames by content fingerprint.
+
+Initialised against the Flask server in create_dash_app.
+'''
+
+import hashlib
+
+from flask_caching import Cache
+import pandas as pd
+
+# Filesystem backend so every worker process serving the app sees the same data.
+# Swap to {'CACHE_TYPE': 'RedisCache', ...} when running across several hosts
+CACHE_CONFIG = {
+    'CACHE_TYPE': 'FileSystemCache',
+    'CACHE_DIR': 'cache',
+    'CACHE_DEFAULT_TIMEOUT': 0,
+}
+
+cache = Cache()
+
+# Per-process copies of the DataFrames held in the server side cache, keyed by content fingerprint
+_DF_REGISTRY: dict[str, pd.DataFrame] = {}
+
+# Column statistics of the registered DataFrames, keyed like _DF_REGISTRY
+_COLUMN_STATS: dict[str, dict] = {}
+
+# Cache entry holding the key of the most recently registered DataFrame
+_LATEST_KEY = 'df:latest'
+
+
+def register_dataframe(df: pd.DataFrame) -> str:
+    '''
+    Registers a source DataFrame in the server side cache.
+
+    Only the returned key needs to be sent to the browser; callbacks fetch the
+    DataFrame itself with get_dataframe. The cache must already be initialised
+    against the app server (done in create_dash_app).
+
+    Cache entries never expire, so registering a DataFrame with different contents
+    deletes the previously registered one from the shared cache rather than leaving
+    its pickle behind. Processes that already fetched it keep their own copy.
+
+    Args:
+        df (pd.DataFrame): The DataFrame charts will be built from.
+
+    Returns:
+        str: A fingerprint of the DataFrame contents, used as the key for
+            get_dataframe and the cached chart functions.
+    '''
+
+    # hash_pandas_object hashes each row in C; digest the row hashes into one key
+    hasher = hashlib.blake2b(digest_size=8)
+    hasher.update(str(tuple(df.columns)).encode())
+    hasher.update(pd.util.hash_pandas_object(df).values.tobytes())
+    df_key = hasher.hexdigest()
+
+    _DF_REGISTRY.setdefault(df_key, df)
+
+    previous_key = cache.get(_LATEST_KEY)
+
+    if previous_key is not None and previous_key != df_key:
+        cache.delete(f'df:{previous_key}')
+
+    cache.set(f'df:{df_key}', df)
+    cache.set(_LATEST_KEY, df_key)
+
+    return df_key
+
+
+def get_dataframe(df_key: str) -> pd.DataFrame:
+    '''
+    Returns a DataFrame registered with register_dataframe.
+
+    Args:
+        df_key (str): Key returned by register_dataframe, e.g. read from dcc.Store.
+
+    Returns:
+        pd.DataFrame: The registered DataFrame. It is shared between callbacks
+            and must not be modified in place.
+
+    Raises:
+        KeyError: If no DataFrame is cached under df_key.
+    '''
+
+    df = _DF_REGISTRY.get(df_key)
+
+    if df is None:
+        # Registered by another worker process; read from the shared cache once
+        df = cache.get(f'df:{df_key}')
+
+        if df is None:
+            raise KeyError(f"No DataFrame cached for key {df_key}")
+
+        _DF_REGISTRY[df_key] = df
+
+    return df
+
+
+def get_column_stats(df: pd.DataFrame) -> dict | None:
+    '''
+    Returns the column statistics of a registered DataFrame, computed on first use.
+
+    Only the registered DataFrame object itself has statistics. Frames derived
+    from it (filtered, re-assigned or re-sorted copies) may hold other values,
+    so they get None and callers fall back to scanning their columns.
+
+    Args:
+        df (pd.DataFrame): A DataFrame returned by get_dataframe.
+
+    Returns:
+        dict | None: 'column_min' and 'column_max' of the numeric columns, the set of
+            'columns_with_missing', and 'sorted_by', the df.attrs['sorted_by'] column
+            if it is sorted ascending (else None). None if df is not registered.
+    '''
+
+    df_key = next((key for key, registered in _DF_REGISTRY.items() if registered is df), None)
+
+    if df_key is None:
+        return None
+
+    if df_key not in _COLUMN_STATS:
+        numeric_columns = df.select_dtypes('number')
+        sorted_by = df.attrs.get('sorted_by')
+
+        _COLUMN_STATS[df_key] = {
+            'column_min': numeric_columns.min().to_dict(),
+            'column_max': numeric_columns.max().to_dict(),
+            'columns_with_missing': set(df.columns[df.isna().any()]),
+            # Checked once here rather than on every filter call
+            'sorted_by': (sorted_by if sorted_by in df.columns
+                          and df[sorted_by].is_monotonic_increasing else None),
+        }
+
+    return _COLUMN_STATS[df_key]
@@ -2,13 +2,13 @@
 Render the home tab for app.
 '''
 
-from io import StringIO
-
 from dash import dcc, html, callback, Input, Output
 from dash.exceptions import PreventUpdate
 import pandas as pd
 import dash_bootstrap_components as dbc
 
+from app.cache import get_dataframe
+
 def render_home_tab(df: pd.DataFrame,) -> dbc.Container:
 
     '''
@@ -49,5 +49,7 @@ def update_daily_metrics(args):
     
     '''
 
+    # Fetch the cached DataFrame using the key in the 'main-data' store, e.g. df = get_dataframe(df_key)
+
 
     return 
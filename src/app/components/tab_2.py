@@ -2,12 +2,13 @@
 Render the 2nd page...
 '''
 
-from io import StringIO
 from dash import dcc, html, callback, Input, Output
 from dash.exceptions import PreventUpdate
 import dash_bootstrap_components as dbc
 import pandas as pd
 
+from app.cache import get_dataframe
+
 def render_page2(df: pd.DataFrame,
                                 ) -> dbc.Container:
 
@@ -45,4 +46,6 @@ def update_individual_violin(args):
 
     '''Input callback to update '''
 
+    # Fetch the cached DataFrame using the key in the 'main-data' store, e.g. df = get_dataframe(df_key)
+
     return 
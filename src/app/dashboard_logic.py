@@ -1,13 +1,25 @@
 
 '''
 Module for dashboard logic functions including
-create state card and create page header
+create state card, create page header, range slider
+and checklist components, range slider parameters,
+filtering and summarising the data for callbacks and
+skipping callbacks whose inputs have not changed
 
 '''
 
+from functools import lru_cache
+import json
+
 import dash_bootstrap_components as dbc
-from dash import html
+from dash import dcc, html
+from dash.exceptions import PreventUpdate
+import numpy as np
+import pandas as pd
+
+from app.cache import get_column_stats, get_dataframe
 
+@lru_cache(maxsize=256)
 def create_stat_card(title: str,
                      id_name: str,
                      text_color: str ='primary',
@@ -31,6 +43,10 @@ def create_stat_card(title: str,
             styled metric display. The card includes a muted title header and
             a large H2 element for the metric value.
 
+    Notes:
+        Results are cached per set of arguments and the same component is returned
+        on repeat calls, so do not modify the returned card in place.
+
     '''
     return dbc.Col(
         dbc.Card([
@@ -46,6 +62,7 @@ def create_stat_card(title: str,
     )
 
 
+@lru_cache(maxsize=256)
 def create_page_header(header_title: str,
                        subtitle: str,
                        footer_text: str ='',
@@ -76,6 +93,10 @@ def create_page_header(header_title: str,
         dbc.Card
             A Dash Bootstrap Component Card object containing the formatted header 
             with the specified title, subtitle, and footer text.
+
+    Notes:
+        Results are cached per set of arguments and the same component is returned
+        on repeat calls, so do not modify the returned card in place.
         
     '''
 
@@ -115,3 +136,376 @@ def create_page_header(header_title: str,
     className='shadow-sm border-0 mb-3 mt-3',
     style={'borderRadius': '10px'}
     )
+
+
+def create_range_slider(id_name: str, slider_params: dict) -> dcc.RangeSlider:
+    '''
+    Returns a RangeSlider built from the output of get_slider_params.
+
+    Parameters:
+        id_name : str
+            The HTML id attribute for the slider, used as a callback Input.
+        slider_params : dict
+            'min', 'max', 'value' and 'marks' settings, as returned by get_slider_params.
+
+    Returns:
+        dcc.RangeSlider
+            The slider component. Cached per set of arguments, so do not modify it in place.
+    '''
+
+    # Freeze the list / dict settings into tuples so the component can be cached
+    return _create_range_slider(id_name,
+                                slider_params['min'],
+                                slider_params['max'],
+                                tuple(slider_params['value']),
+                                tuple(slider_params['marks'].items()))
+
+
+@lru_cache(maxsize=64)
+def _create_range_slider(id_name: str,
+                         min_val: int,
+                         max_val: int,
+                         value: tuple,
+                         marks: tuple) -> dcc.RangeSlider:
+    '''Cached implementation of create_range_slider, taking only hashable arguments.'''
+
+    return dcc.RangeSlider(id=id_name,
+                           min=min_val,
+                           max=max_val,
+                           step=1,
+                           value=list(value),
+                           marks=dict(marks),
+                           allowCross=False)
+
+
+def create_checklist(id_name: str,
+                     options: list[str],
+                     value: list[str] = None) -> dbc.Checklist:
+    '''
+    Returns an inline, switch style Checklist, e.g. for selecting which groups to plot.
+
+    Parameters:
+        id_name : str
+            The HTML id attribute for the checklist, used as a callback Input.
+        options : list[str]
+            The values to choose from, which are also used as their labels.
+        value : list[str], optional
+            The values selected initially. Defaults to all options.
+
+    Returns:
+        dbc.Checklist
+            The checklist component. Cached per set of arguments, so do not modify it in place.
+    '''
+
+    # Freeze the lists into tuples so the component can be cached
+    return _create_checklist(id_name,
+                             tuple(options),
+                             tuple(value) if value is not None else tuple(options))
+
+
+@lru_cache(maxsize=64)
+def _create_checklist(id_name: str, options: tuple, value: tuple) -> dbc.Checklist:
+    '''Cached implementation of create_checklist, taking only hashable arguments.'''
+
+    return dbc.Checklist(id=id_name,
+                         options=[{'label': option, 'value': option} for option in options],
+                         value=list(value),
+                         inline=True,
+                         switch=True)
+
+
+@lru_cache(maxsize=16)
+def get_slider_params(df_key: str,
+                      column: str,
+                      group: str = None,
+                      mark_step: int = 1,
+                      mark_suffix: str = '') -> dict:
+    '''
+    Returns the settings for a dcc.RangeSlider over a column of the cached data.
+
+    The result depends only on the registered DataFrame, so it is calculated once
+    per set of arguments rather than on every page render.
+
+    Parameters:
+        df_key : str
+            Key returned by app.cache.register_dataframe.
+        column : str
+            The numeric column the slider filters on, e.g. 'age_in_weeks'.
+        group : str, optional
+            If provided, the default upper value is the smallest per-group maximum,
+            so every group (e.g. each child) has data across the default range.
+        mark_step : int, optional
+            Interval between slider marks (default is 1).
+        mark_suffix : str, optional
+            Text appended to each mark label, e.g. ' wks' (default is '').
+
+    Returns:
+        dict
+            'min', 'max', 'value' (the default [low, high]) and 'marks', ready to
+            unpack into dcc.RangeSlider. Shared between calls, so do not modify.
+    '''
+
+    df = get_dataframe(df_key)
+
+    min_val, max_val = (int(value) for value in df[column].agg(['min', 'max']))
+
+    default_high = max_val
+    if group is not None:
+        default_high = int(df.groupby(group, sort=False, observed=True)[column].max().min())
+
+    # Build every mark label in one vectorised call rather than an f-string per mark
+    ticks = np.arange(min_val, max_val + 1, mark_step)
+    labels = np.char.add(ticks.astype(str), mark_suffix)
+
+    return {
+        'min': min_val,
+        'max': max_val,
+        'value': [min_val, default_high],
+        'marks': dict(zip(ticks.tolist(), labels.tolist())),
+    }
+
+
+@lru_cache(maxsize=16)
+def get_checklist_options(df_key: str, column: str) -> list:
+    '''
+    Returns the sorted unique values of a column of the cached data, e.g. the
+    options for create_checklist.
+
+    Parameters:
+        df_key : str
+            Key returned by app.cache.register_dataframe.
+        column : str
+            The column to list the values of, e.g. 'name'.
+
+    Returns:
+        list
+            Sorted unique non-missing values. Shared between calls, so do not modify.
+    '''
+
+    series = get_dataframe(df_key)[column]
+
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # astype('category') already stores the sorted unique values as the categories
+        return series.cat.categories.tolist()
+
+    return series.dropna().drop_duplicates().sort_values().tolist()
+
+
+def _sorted_window(sorted_values: np.ndarray, low, high) -> slice:
+    '''
+    Finds the rows of an ascending column within the inclusive range low to high.
+
+    Integer bounds are rounded inwards and cast to the column's dtype, so
+    searchsorted compares in that dtype instead of upcasting the whole column
+    (e.g. an int16 slider column searched with a Python int or float).
+    '''
+
+    if pd.api.types.is_integer_dtype(sorted_values.dtype):
+        info = np.iinfo(sorted_values.dtype)
+        low, high = np.ceil(low), np.floor(high)
+
+        # A range entirely outside the dtype's values selects no rows
+        if low > info.max or high < info.min:
+            return slice(0, 0)
+
+        low = sorted_values.dtype.type(max(low, info.min))
+        high = sorted_values.dtype.type(min(high, info.max))
+
+    elif pd.api.types.is_float_dtype(sorted_values.dtype):
+        low, high = sorted_values.dtype.type(low), sorted_values.dtype.type(high)
+
+    start = int(np.searchsorted(sorted_values, low, side='left'))
+    stop = int(np.searchsorted(sorted_values, high, side='right'))
+
+    # A range with low > high gives stop < start; keep it an empty window
+    return slice(start, max(start, stop))
+
+
+def _filter_window(df: pd.DataFrame,
+                   selections: dict[str, list] = None,
+                   ranges: dict[str, tuple] = None) -> tuple[slice, np.ndarray]:
+    '''
+    Narrows the filters to a window of rows and a boolean mask over that window.
+
+    When df is the registered DataFrame itself, per get_column_stats:
+        - a range on its sorted_by column is resolved with two binary searches,
+          so the remaining filters only compare the rows inside that range
+        - filters that cannot exclude any row (every category selected, or a
+          range spanning the column's full extent) are skipped
+    Derived frames (filtered, re-assigned or re-sorted copies) compare every row.
+    '''
+
+    ranges = dict(ranges or {})
+    window = slice(0, len(df))
+
+    # Derived frames have no statistics, so none of their filters are skipped
+    stats = get_column_stats(df) or {}
+    column_min = stats.get('column_min', {})
+    column_max = stats.get('column_max', {})
+    columns_with_missing = stats.get('columns_with_missing', df.columns)
+    sorted_by = stats.get('sorted_by')
+
+    if sorted_by in ranges:
+        window = _sorted_window(df[sorted_by].to_numpy(), *ranges.pop(sorted_by))
+
+    mask = np.ones(window.stop - window.start, dtype=bool)
+
+    for column, values in (selections or {}).items():
+        series = df[column]
+
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            # Look up each row's integer code in a small table over the categories.
+            # The extra final slot is False and catches the -1 code used for missing values
+            categories = series.cat.categories
+            selected = np.zeros(len(categories) + 1, dtype=bool)
+            positions = categories.get_indexer(list(values))
+            selected[positions[positions >= 0]] = True
+
+            # e.g. the default view with every group ticked
+            if selected[:-1].all() and column not in columns_with_missing:
+                continue
+
+            mask &= selected[series.cat.codes.to_numpy()[window]]
+        else:
+            mask &= series.iloc[window].isin(values).to_numpy()
+
+    for column, (low, high) in ranges.items():
+        # e.g. a range slider left at its end points
+        if (column in column_min and column in column_max and column not in columns_with_missing
+                and low <= column_min[column] and high >= column_max[column]):
+            continue
+
+        column_values = df[column].to_numpy()[window]
+        mask &= (column_values >= low) & (column_values <= high)
+
+    return window, mask
+
+
+def build_filter_mask(df: pd.DataFrame,
+                      selections: dict[str, list] = None,
+                      ranges: dict[str, tuple] = None) -> np.ndarray:
+    '''
+    Builds a boolean row mask for the filters selected in a callback.
+
+    Filters are applied to the underlying NumPy arrays rather than through a
+    df.query string, which would be parsed again on every call. When create_dash_app
+    has sorted the data (SORT_COLUMN), a range on that column is found by binary search.
+
+    Parameters:
+        df : pd.DataFrame
+            The DataFrame to filter.
+        selections : dict[str, list], optional
+            Column name to the values to keep, e.g. {'name': ['a', 'b']} from a checklist.
+        ranges : dict[str, tuple], optional
+            Column name to an inclusive (low, high) range, e.g. from a range slider.
+
+    Returns:
+        np.ndarray
+            Boolean array with one entry per row of df.
+    '''
+
+    window, window_mask = _filter_window(df, selections, ranges)
+
+    mask = np.zeros(len(df), dtype=bool)
+    mask[window] = window_mask
+
+    return mask
+
+
+def filter_dataframe(df: pd.DataFrame,
+                     selections: dict[str, list] = None,
+                     ranges: dict[str, tuple] = None) -> pd.DataFrame:
+    '''
+    Returns the rows of df matching the selected filters.
+
+    Parameters:
+        df : pd.DataFrame
+            The DataFrame to filter.
+        selections : dict[str, list], optional
+            Column name to the values to keep. See build_filter_mask.
+        ranges : dict[str, tuple], optional
+            Column name to an inclusive (low, high) range. See build_filter_mask.
+
+    Returns:
+        pd.DataFrame
+            The filtered rows of df.
+    '''
+
+    window, window_mask = _filter_window(df, selections, ranges)
+
+    return df.iloc[window.start + np.flatnonzero(window_mask)]
+
+
+def summarise_selection(df: pd.DataFrame,
+                        column: str,
+                        selections: dict[str, list] = None,
+                        ranges: dict[str, tuple] = None) -> dict:
+    '''
+    Calculates summary metrics of a column over the rows matching the selected filters,
+    e.g. for the values shown in stat cards.
+
+    Only the one column is sliced, so no filtered copy of the whole DataFrame is made.
+
+    Parameters:
+        df : pd.DataFrame
+            The DataFrame to summarise.
+        column : str
+            The numeric column to summarise.
+        selections : dict[str, list], optional
+            Column name to the values to keep. See build_filter_mask.
+        ranges : dict[str, tuple], optional
+            Column name to an inclusive (low, high) range. See build_filter_mask.
+
+    Returns:
+        dict
+            'total' and 'mean' of the column, ignoring missing values as pandas does,
+            and 'count' of the matching rows. 'mean' is NaN when nothing matches.
+    '''
+
+    window, window_mask = _filter_window(df, selections, ranges)
+    selected = df[column].to_numpy()[window][window_mask]
+
+    return {
+        'total': float(np.nansum(selected)),
+        'mean': float(np.nanmean(selected)) if selected.size else float('nan'),
+        'count': int(selected.size),
+    }
+
+
+def prevent_if_unchanged(previous_signature: str, *inputs) -> str:
+    '''
+    Stops a callback early when its inputs match those of its previous run.
+
+    The signature is kept per browser session by writing the returned value to a
+    dcc.Store that the callback also reads as a State, so one user's inputs never
+    suppress another user's update:
+
+        @callback(Output('chart', 'figure'), Output('chart-signature', 'data'),
+                  Input('checklist', 'value'), Input('slider', 'value'),
+                  State('chart-signature', 'data'))
+        def update_chart(selected, value_range, previous_signature):
+            signature = prevent_if_unchanged(previous_signature, selected, value_range)
+            ...
+            return fig, signature
+
+    Parameters:
+        previous_signature : str
+            Signature returned by the previous run, or None on the first run.
+        *inputs
+            The callback's JSON serialisable input values.
+
+    Returns:
+        str
+            Signature of the current inputs, to write back to the dcc.Store.
+
+    Raises:
+        PreventUpdate
+            If the inputs are unchanged since the previous run.
+    '''
+
+    signature = json.dumps(inputs, sort_keys=True, default=str)
+
+    if signature == previous_signature:
+        raise PreventUpdate
+
+    return signature
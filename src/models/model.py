@@ -4,7 +4,7 @@ Create pydantic model
 
 from datetime import datetime
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -12,6 +12,10 @@ class Data(BaseModel):
 
     '''Class representing validation schema'''
 
+    # Store enum members as their values so model_dump needs no json mode,
+    # leaving datetimes as datetime objects rather than ISO strings
+    model_config = ConfigDict(use_enum_values=True)
+
     var_1: int
     var_2: float
     date_var: datetime
@@ -2,13 +2,211 @@
 Steps orchestrated within the DataProcessor class.
 '''
 
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
 from pathlib import Path
+import re
 
+import numpy as np
 import pandas as pd
-from pydantic import ValidationError
+from pydantic import BaseModel, TypeAdapter, ValidationError
 
 from models.model import Data
 
+# Validates a whole list of records against Data in one call, reusing the compiled schema
+_DATA_LIST_ADAPTER = TypeAdapter(list[Data])
+
+
+class _NotVectorisable(Exception):
+    '''Raised by a converter for values only pydantic can parse exactly.'''
+
+
+# Largest integer float64 holds exactly; bigger values lose precision in to_numeric
+_MAX_EXACT_FLOAT_INT = 2 ** 53
+
+# Strings pydantic parses as a float NaN (after stripping and lower-casing)
+_NAN_STRINGS = {'nan', '+nan', '-nan'}
+
+# Datetime strings pydantic parses (RFC 3339 dates and date-times, e.g. '2024-01-01',
+# '2024-01-01 10:00' or '2024-01-01T10:00:00.5+02:00'), and the subset that pandas'
+# ISO 8601 parser reads the same way. Year 0000 is rejected by pydantic only
+_PYDANTIC_DATETIME = re.compile(
+    r'(?!0000)\d{4}-\d{2}-\d{2}'
+    r'(?:[Tt _]\d{2}:\d{2}(?::\d{2}(?:[.,]\d+)?)?(?:[Zz]|[+-]\d{2}:?\d{2})?)?')
+_PANDAS_DATETIME = re.compile(
+    r'(?!0000)\d{4}-\d{2}-\d{2}'
+    r'(?:[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d{1,6})?)?(?:Z|[+-]\d{2}:?\d{2})?)?')
+
+# model_config keys that leave validation of plain fields unchanged
+_VECTORISED_CONFIG_KEYS = {'title', 'use_enum_values'}
+
+
+def _convert_int(series: pd.Series) -> tuple[pd.Series, pd.Series]:
+    '''Coerces a column to integers, flagging non-numeric, missing and fractional values.'''
+    values = pd.to_numeric(series, errors='coerce')
+
+    # Ints beyond int64 (uint64 / object) or floats beyond 2**53 cannot be checked
+    # or cast exactly here
+    if values.dtype in ('uint64', object):
+        raise _NotVectorisable(series.name)
+
+    if pd.api.types.is_integer_dtype(values) or pd.api.types.is_bool_dtype(values):
+        return values, values.isna()
+
+    if (values.abs() > _MAX_EXACT_FLOAT_INT).any():
+        raise _NotVectorisable(series.name)
+
+    return values, values.isna() | (values % 1 != 0)
+
+
+def _convert_float(series: pd.Series) -> tuple[pd.Series, pd.Series]:
+    '''Coerces a column to floats, flagging non-numeric and None values (NaN is a valid float).'''
+    values = pd.to_numeric(series, errors='coerce')
+
+    if pd.api.types.is_numeric_dtype(series):
+        return values, pd.Series(False, index=series.index)
+
+    is_nan = series.map(lambda value: isinstance(value, float)
+                        or (isinstance(value, str) and value.strip().lower() in _NAN_STRINGS))
+
+    return values, values.isna() & ~is_nan
+
+
+def _convert_datetime(series: pd.Series) -> tuple[pd.Series, pd.Series]:
+    '''Coerces a column to datetimes, flagging missing, unparseable and non-RFC 3339 values.'''
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series, series.isna()
+
+    # pydantic reads numbers and numeric strings as unix timestamps
+    if pd.to_numeric(series, errors='coerce').notna().any():
+        raise _NotVectorisable(series.name)
+
+    # pandas also parses shapes pydantic rejects, e.g. '2024/01/01' or '2024-1-5'
+    is_str = series.map(lambda value: isinstance(value, str)).to_numpy(dtype=bool)
+    strings = series[is_str]
+    pandas_shape = strings.str.fullmatch(_PANDAS_DATETIME).to_numpy(dtype=bool)
+
+    # e.g. '2024-01-01t10:00' or '2024-01-01T10:00:00,5', which only pydantic reads
+    if strings[~pandas_shape].str.fullmatch(_PYDANTIC_DATETIME).any():
+        raise _NotVectorisable(series.name)
+
+    bad_shape = np.zeros(len(series), dtype=bool)
+    bad_shape[np.flatnonzero(is_str)[~pandas_shape]] = True
+
+    try:
+        values = pd.to_datetime(series, errors='coerce', format='ISO8601')
+    except (TypeError, ValueError) as e:
+        # Mixed UTC offsets (or naive and aware values) have no single pandas dtype
+        raise _NotVectorisable(series.name) from e
+
+    return values, values.isna() | bad_shape
+
+
+def _convert_str(series: pd.Series) -> tuple[pd.Series, pd.Series]:
+    '''Flags values that are not strings; pydantic does not coerce numbers to str.'''
+    return series, ~series.map(lambda value: isinstance(value, str))
+
+
+# Vectorised column converters, final dtypes and error messages for the plain
+# field types pydantic would otherwise validate one row at a time.
+# Datetimes keep the converter's dtype, so timezone-aware columns stay aware
+_VECTORISED_FIELD_TYPES = {
+    int: (_convert_int, 'int64', 'Input should be a valid integer'),
+    float: (_convert_float, 'float64', 'Input should be a valid number'),
+    datetime: (_convert_datetime, None, 'Input should be a valid datetime'),
+    str: (_convert_str, 'object', 'Input should be a valid string'),
+}
+
+
+def _vectorised_field_types(model: type[BaseModel], columns: pd.Index) -> dict | None:
+    '''
+    Maps each model field's column (its alias, else its name) to the field name,
+    vectorised converter, final dtype and error message.
+
+    Returns None when the model can only be validated row by row with pydantic,
+    i.e. it has custom validators, field constraints, a non-default model_config
+    (e.g. strict=True or extra='forbid'), unsupported annotations (e.g. enums or
+    optionals) or a field column is missing from the data.
+    '''
+
+    decorators = model.__pydantic_decorators__
+
+    if decorators.field_validators or decorators.model_validators or decorators.validators:
+        return None
+
+    if set(model.model_config) - _VECTORISED_CONFIG_KEYS:
+        return None
+
+    field_types = {}
+
+    for name, field in model.model_fields.items():
+        column = field.alias or name
+
+        if (field.annotation not in _VECTORISED_FIELD_TYPES
+                or field.metadata
+                or column not in columns):
+            return None
+
+        field_types[column] = (name, *_VECTORISED_FIELD_TYPES[field.annotation])
+
+    return field_types
+
+
+def _strip_timezones(df: pd.DataFrame) -> pd.DataFrame:
+    '''Converts timezone-aware datetimes to naive UTC, as Excel cannot store timezones.'''
+
+    def to_naive_utc(value):
+        if isinstance(value, datetime) and value.tzinfo is not None:
+            return pd.Timestamp(value).tz_convert('UTC').tz_localize(None)
+        return value
+
+    converted = {}
+
+    for column, series in df.items():
+        if isinstance(series.dtype, pd.DatetimeTZDtype):
+            converted[column] = series.dt.tz_convert(None)
+        elif series.dtype == object:
+            # e.g. mixed UTC offsets validated row by row, or aware values in the error rows
+            naive = series.map(to_naive_utc)
+            if not naive.equals(series):
+                converted[column] = naive
+
+    return df.assign(**converted) if converted else df
+
+
+def _validate_record_batch(records: list[dict]) -> tuple[list[dict], dict[int, list[tuple]]]:
+    '''
+    Validates a list of records against Data in one call into pydantic-core.
+
+    Defined at module level so it can be run in worker processes.
+
+    Returns the valid records as plain dicts, and the (field, message) errors of each
+    failing record keyed by its position in records.
+    '''
+
+    errors_by_row = {}
+
+    try:
+        validated = _DATA_LIST_ADAPTER.validate_python(records)
+
+    except ValidationError as e:
+
+        # Each error's loc starts with the row position, followed by the field path.
+        # Model level errors (e.g. from a model_validator, or a row that is not a dict)
+        # have no field path and are reported against '__root__'
+        for err in e.errors():
+            field = '.'.join(map(str, err['loc'][1:])) or '__root__'
+            errors_by_row.setdefault(err['loc'][0], []).append((field, err['msg']))
+
+        # The remaining rows are known to be valid
+        validated = _DATA_LIST_ADAPTER.validate_python(
+            [record for i, record in enumerate(records) if i not in errors_by_row])
+
+    # Data stores enum values (use_enum_values), so python mode already gives plain
+    # values while keeping datetimes typed; no re-parse of ISO strings is needed
+    return _DATA_LIST_ADAPTER.dump_python(validated), errors_by_row
+
+
 class DataPipeline:
     '''
     Class for loading, cleaning, validating and processing data.
@@ -22,14 +220,38 @@ class DataPipeline:
     def __init__(self,
                  file_name: str,
                  input_dir_path: str = 'data',
-                 excel_params: dict = None):
+                 excel_params: dict = None,
+                 use_cache: bool = True,
+                 duplicate_subset: list[str] = None,
+                 category_columns: list[str] = None,
+                 n_workers: int = 1):
 
         '''
         Initializes the DataProcessor with configuration.
+
+        If use_cache is True, Excel inputs are cached in a Parquet file alongside
+        the source (e.g. x.xlsx.cache.parquet) and re-read from there until the
+        source file changes.
+
+        duplicate_subset names the columns identifying a record (e.g. ['name', 'date_var']),
+        so duplicate checks only hash those columns. Defaults to all columns.
+
+        category_columns lists low cardinality text columns (e.g. ['name']) converted to
+        pandas Categorical after transformation, for fast isin / groupby downstream.
+
+        n_workers sets how many processes validate rows in parallel when the model has to
+        be checked row by row with pydantic (see _validate_inputs). Defaults to 1.
+        The spawn and forkserver start methods (the defaults on Windows, macOS and, from
+        Python 3.14, Linux) re-import the calling script in each worker, so scripts using
+        n_workers > 1 must run the pipeline under an if __name__ == '__main__': guard.
         '''
 
         self.file_name = file_name
         self.input_dir_path = input_dir_path
+        self.use_cache = use_cache
+        self.duplicate_subset = duplicate_subset
+        self.category_columns = category_columns if category_columns is not None else []
+        self.n_workers = n_workers
 
         # Initialize blank dataframes to be updated during processing
         self.raw_data: pd.DataFrame = None
@@ -68,7 +290,7 @@ class DataPipeline:
         suffix = self.full_file_path.suffix.lower()
 
         if suffix in ('.xls', '.xlsx'):
-            df = pd.read_excel(self.full_file_path, **self.excel_params)
+            df = self._read_excel()
         elif suffix == '.csv':
             # Example for CSV
             df = pd.read_csv(self.full_file_path, **self.excel_params)
@@ -79,13 +301,50 @@ class DataPipeline:
 
         return df
 
+    def _read_excel(self) -> pd.DataFrame:
+        '''
+        Reads the Excel input, using a Parquet copy saved next to it when available.
+
+        The cache is keyed on the source file's modification time and the read
+        parameters, so it is rebuilt whenever either changes.
+        '''
+
+        if not self.use_cache:
+            return pd.read_excel(self.full_file_path, **self.excel_params)
+
+        # e.g. data/x.xlsx.cache.parquet, which cannot overwrite a user's own data/x.parquet
+        cache_path = self.full_file_path.with_name(f"{self.full_file_path.name}.cache.parquet")
+        cache_key = f"{self.full_file_path.stat().st_mtime_ns}|{self.excel_params!r}"
+
+        if cache_path.exists():
+            df = pd.read_parquet(cache_path, engine='pyarrow')
+
+            if df.attrs.pop('source_cache_key', None) == cache_key:
+                return df
+
+        df = pd.read_excel(self.full_file_path, **self.excel_params)
+
+        # attrs are stored in the Parquet metadata and read back with the data
+        df.attrs['source_cache_key'] = cache_key
+
+        try:
+            df.to_parquet(cache_path, engine='pyarrow', compression='zstd')
+        except (OSError, TypeError, ValueError) as e:
+            # e.g. columns mixing numbers and text cannot be stored as Arrow types
+            print(f"\n⚠️ Could not cache {self.file_name} as Parquet, "
+                  f"it will be re-read from Excel next time: {e}")
+
+        df.attrs.pop('source_cache_key')
+
+        return df
+
     def _clean_data(self, df: pd.DataFrame) -> pd.DataFrame:
         '''
         Cleans the data by handling missing values and duplicates.
         '''
 
         # Run throuhgh cleaning steps
-        df = df.drop_duplicates()
+        df = df.drop_duplicates(subset=self.duplicate_subset, keep='first', ignore_index=True)
 
         return df
 
@@ -94,41 +353,32 @@ class DataPipeline:
         Validates the data using Pydantic models based model 
         defined in models/XYZ.py.
         Removes invalid records and logs errors.
+
+        Models made of plain int / float / str / datetime fields are checked a
+        column at a time with vectorised pandas conversions. Any other model
+        (validators, constraints, enums, non-default config etc.), or data the
+        conversions cannot check exactly (ints beyond 2**53, unix timestamps,
+        mixed UTC offsets), is validated row by row with pydantic.
         '''
 
         # Access the class constants using self.BOLD and self.END
         bold = self.bold
         end_bold = self.end_bold
 
-        valid_records = []
-        error_records = []
+        field_types = _vectorised_field_types(Data, df.columns)
+        results = None
 
-        # Validate each row using Pydantic models
-        for record_dict in df.to_dict('records'):
+        if field_types is not None:
             try:
-                # The Pydantic model validates the row data during instantiation
-                record = Data(**record_dict)
-
-                # ensures enum values serialized to str by using json mode
-                valid_records.append(record.model_dump(mode='json'))
-
-            except ValidationError as e:
+                results = self._validate_columns(df, field_types)
+            except _NotVectorisable:
+                # e.g. unix timestamps or mixed UTC offsets, left to pydantic
+                pass
 
-                # Format the message for a single error, separated by new lines
-                details = "\n".join(
-                    f"{i}) {err['loc'][0]}: {err['msg']}"
-                    for i, err in enumerate(e.errors(), 1)
-                    )
-
-                # 2. Add one single entry to the error list
-                error_records.append({
-                    **record_dict,
-                    'total_errors': e.error_count(),
-                    'error_details': details
-                })
+        if results is None:
+            results = self._validate_records(df)
 
-        df_validated = pd.DataFrame(valid_records)
-        df_errors = pd.DataFrame(error_records)
+        df_validated, df_errors = results
 
         total_errors = df_errors['total_errors'].sum() if not df_errors.empty else 0
 
@@ -150,6 +400,106 @@ class DataPipeline:
 
         return df_validated
 
+    def _validate_columns(self,
+                          df: pd.DataFrame,
+                          field_types: dict) -> tuple[pd.DataFrame, pd.DataFrame]:
+        '''
+        Validates every field of the model in one vectorised pass per column.
+
+        Returns the validated data, cast to the field types and named by field as
+        in _validate_records, and the failing rows with their error counts and details.
+        Raises _NotVectorisable when a column holds values only pydantic can parse.
+
+        Known differences from pydantic's lax mode:
+            - error details give one generic message per type, not pydantic's
+              specific reason (e.g. 'got a number with a fractional part')
+            - int columns accept exponent strings ('1e3'), and int / float columns
+              reject underscore separators ('1_000'), the reverse of pydantic
+            - missing datetimes (NaT) are rejected, whereas pydantic accepts
+              pandas' NaT as a datetime
+        '''
+
+        converted = {}
+        invalid = {}
+
+        for column, (name, converter, _, _) in field_types.items():
+            converted[name], invalid[column] = converter(df[column])
+
+        invalid_df = pd.DataFrame(invalid, index=df.index)
+        error_counts = invalid_df.sum(axis=1)
+        has_errors = (error_counts > 0).to_numpy()
+
+        df_validated = (pd.DataFrame(converted, index=df.index)[~has_errors]
+                        .astype({name: dtype for name, _, dtype, _ in field_types.values()
+                                 if dtype is not None})
+                        .reset_index(drop=True))
+
+        # Error messages are only built for the failing rows
+        messages = pd.DataFrame(
+            {column: np.where(invalid_df[column].to_numpy()[has_errors], f"{column}: {message}", '')
+             for column, (_, _, _, message) in field_types.items()})
+
+        details = [
+            "\n".join(f"{i}) {message}" for i, message in enumerate(filter(None, row), 1))
+            for row in messages.itertuples(index=False, name=None)
+        ]
+
+        df_errors = df[has_errors].assign(
+            total_errors=error_counts[has_errors],
+            error_details=details).reset_index(drop=True)
+
+        return df_validated, df_errors
+
+    def _validate_records(self, df: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
+        '''
+        Validates every row against the pydantic model in batch calls,
+        split across n_workers processes when more than one is configured.
+
+        Returns the validated data and the failing rows with their error counts and details.
+        '''
+
+        # itertuples yields plain tuples, skipping the per-value boxing of to_dict('records')
+        columns = df.columns.tolist()
+        records = [dict(zip(columns, row)) for row in df.itertuples(index=False, name=None)]
+
+        if self.n_workers > 1 and len(records) > self.n_workers:
+            chunk_size = -(-len(records) // self.n_workers)
+            chunk_starts = range(0, len(records), chunk_size)
+
+            # Processes rather than threads: pydantic-core holds the GIL while validating
+            with ProcessPoolExecutor(max_workers=self.n_workers) as executor:
+                results = executor.map(_validate_record_batch,
+                                       [records[start:start + chunk_size] for start in chunk_starts])
+
+                valid_records = []
+                errors_by_row = {}
+
+                for start, (chunk_valid, chunk_errors) in zip(chunk_starts, results):
+                    valid_records.extend(chunk_valid)
+                    errors_by_row.update(
+                        {start + row: row_errors for row, row_errors in chunk_errors.items()})
+        else:
+            valid_records, errors_by_row = _validate_record_batch(records)
+
+        # Add one single entry to the error list per failing row,
+        # with its messages separated by new lines
+        error_records = [
+            {
+                **records[row],
+                'total_errors': len(row_errors),
+                'error_details': "\n".join(
+                    f"{i}) {field}: {message}"
+                    for i, (field, message) in enumerate(row_errors, 1)
+                    )
+            }
+            for row, row_errors in errors_by_row.items()
+        ]
+
+        # Naming the model's fields as columns skips inferring them from every record's keys
+        df_validated = pd.DataFrame.from_records(valid_records, columns=list(Data.model_fields))
+
+        return df_validated, pd.DataFrame(error_records)
+
     def _transform_data(self, df: pd.DataFrame) -> pd.DataFrame:
 
         '''
@@ -165,6 +515,9 @@ class DataPipeline:
 
         # Run through tranform steps
 
+        # Finally hold grouping columns as integer coded categoricals
+        df = df.astype(dict.fromkeys(self.category_columns, 'category'))
+
         self.transformed_data = df
 
         return df
@@ -195,6 +548,8 @@ class DataPipeline:
             export_validated: If True, exports self.validated_data to 'Validated Data' sheet.
             output_folder: The sub-folder relative to the current working directory.
                             Defaults to 'reporting'.
+
+        Timezone-aware datetimes are written as UTC, since Excel has no timezone support.
         '''
 
         # Prepare data mapping and checks
@@ -254,12 +609,17 @@ class DataPipeline:
 
         # Perform the multi-sheet export with robust error handling
         try:
-            with pd.ExcelWriter(output_file, datetime_format='dd/mm/yyyy') as writer:
+            # xlsxwriter serialises sheets faster and with less overhead than openpyxl.
+            # Its constant_memory mode is not used: pandas writes cells column by column,
+            # which that mode (rows must be written in order) would silently truncate
+            with pd.ExcelWriter(output_file,
+                                engine='xlsxwriter',
+                                datetime_format='dd/mm/yyyy') as writer:
                 exported_items = []
                 for item in data_to_export:
-                    item['df'].to_excel(writer,
-                                        sheet_name=item['sheet_name'],
-                                        index=False)
+                    _strip_timezones(item['df']).to_excel(writer,
+                                                          sheet_name=item['sheet_name'],
+                                                          index=False)
                     exported_items.append(item['description'])
 
             # Success message generation
@@ -0,0 +1,97 @@
+'''
+Tests for the base graph helpers.
+'''
+
+import unittest
+
+from flask import Flask
+import numpy as np
+import pandas as pd
+import plotly.io as pio
+
+from app.base_graphs import create_base_figure, get_cached_group_totals, rolling_mean
+from app.cache import cache, register_dataframe
+
+
+class TestRollingMean(unittest.TestCase):
+    '''
+    Tests cover:
+    - rolling_mean matches pandas rolling(window, min_periods=1).mean()
+    - missing values only affect the windows containing them
+    - windows smaller than 1 are rejected
+    '''
+
+    def test_matches_pandas(self):
+        rng = np.random.default_rng(0)
+        values = rng.normal(size=200)
+        values[rng.random(200) < 0.3] = np.nan
+
+        for window in (1, 3, 10, 500):
+            with self.subTest(window=window):
+                expected = pd.Series(values).rolling(window, min_periods=1).mean().to_numpy()
+                np.testing.assert_allclose(rolling_mean(values, window), expected)
+
+    def test_missing_values(self):
+        np.testing.assert_allclose(rolling_mean([1, 2, np.nan, 4, 5, 6], 3),
+                                   [1, 1.5, 1.5, 3, 4.5, 5])
+
+    def test_invalid_window(self):
+        with self.assertRaises(ValueError):
+            rolling_mean([1.0, 2.0], 0)
+
+
+class TestBaseFigure(unittest.TestCase):
+    '''
+    Tests cover:
+    - new figures take the template active when they are built, not at import
+    '''
+
+    def setUp(self):
+        self.default_template = pio.templates.default
+
+    def tearDown(self):
+        pio.templates.default = self.default_template
+
+    def test_uses_active_template(self):
+        pio.templates.default = 'simple_white'
+        fig = create_base_figure()
+
+        self.assertEqual(fig.layout.template, pio.templates['simple_white'])
+        self.assertEqual(fig.layout.yaxis.rangemode, 'tozero')
+
+
+class TestGroupTotals(unittest.TestCase):
+    '''
+    Tests cover:
+    - get_cached_group_totals sums only the rows matching the filters
+    '''
+
+    @classmethod
+    def setUpClass(cls):
+        server = Flask(__name__)
+        cache.init_app(server, config={'CACHE_TYPE': 'SimpleCache'})
+
+        df = pd.DataFrame({
+            'week': [1, 1, 2, 2, 3],
+            'name': pd.Categorical(['a', 'b', 'a', 'b', 'a']),
+            'amount': [10.0, 30.0, 20.0, 20.0, 5.0],
+        })
+
+        with server.app_context():
+            cls.df_key = register_dataframe(df)
+
+    def test_filtered_totals(self):
+        totals = get_cached_group_totals(self.df_key, ('week', 'name'), 'amount',
+                                         selections=(('name', ('a', 'b')),),
+                                         ranges=(('week', (1, 2)),))
+
+        self.assertEqual(totals['amount'].tolist(), [10.0, 30.0, 20.0, 20.0])
+        self.assertEqual(totals['share_label'].tolist(), ['25.0%', '75.0%', '50.0%', '50.0%'])
+
+    def test_unfiltered_totals(self):
+        totals = get_cached_group_totals(self.df_key, ('week',), 'amount')
+        self.assertEqual(totals['amount'].tolist(), [40.0, 40.0, 5.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+'''
+Tests for the server side DataFrame cache.
+'''
+
+import tempfile
+import unittest
+
+from flask import Flask
+import pandas as pd
+
+from app.cache import CACHE_CONFIG, cache, get_dataframe, register_dataframe
+
+
+class TestRegisterDataFrame(unittest.TestCase):
+    '''
+    Tests cover:
+    - registered DataFrames are fetched back by key
+    - registering new data removes the previous DataFrame from the shared cache
+    '''
+
+    def setUp(self):
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.cache_dir.cleanup)
+
+        self.server = Flask(__name__)
+        cache.init_app(self.server, config={**CACHE_CONFIG, 'CACHE_DIR': self.cache_dir.name})
+
+    def test_round_trip(self):
+        df = pd.DataFrame({'v': [1, 2, 3]})
+
+        with self.server.app_context():
+            df_key = register_dataframe(df)
+
+            pd.testing.assert_frame_equal(get_dataframe(df_key), df)
+            pd.testing.assert_frame_equal(cache.get(f'df:{df_key}'), df)
+
+    def test_previous_data_removed(self):
+        with self.server.app_context():
+            old_key = register_dataframe(pd.DataFrame({'v': [1, 2, 3]}))
+            new_key = register_dataframe(pd.DataFrame({'v': [4, 5, 6]}))
+
+            self.assertNotEqual(old_key, new_key)
+            self.assertIsNone(cache.get(f'df:{old_key}'))
+            self.assertIsNotNone(cache.get(f'df:{new_key}'))
+
+            # Registering the same contents again keeps them cached
+            register_dataframe(pd.DataFrame({'v': [4, 5, 6]}))
+            self.assertIsNotNone(cache.get(f'df:{new_key}'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,152 @@
+'''
+Tests for the dashboard filter helpers, checked against plain pandas filtering.
+'''
+
+import unittest
+
+from flask import Flask
+import numpy as np
+import pandas as pd
+
+from app.base_graphs import column_max
+from app.cache import cache, get_column_stats, register_dataframe
+from app.dashboard_logic import _filter_window, build_filter_mask, filter_dataframe
+
+
+def make_df() -> pd.DataFrame:
+    '''Small frame with a categorical, a text and a numeric column, including missing values.'''
+    return pd.DataFrame({
+        'name': pd.Categorical(['a', 'b', None, 'c', 'a', 'b']),
+        'label': ['x', 'y', 'x', None, 'y', 'x'],
+        'value': [1.0, 2.0, 3.0, np.nan, 5.0, 6.0],
+    })
+
+
+class TestFilterHelpers(unittest.TestCase):
+    '''
+    Tests cover:
+    - build_filter_mask matches isin / between filters on categorical and other columns
+    - missing values are never selected
+    - filter_dataframe returns the masked rows with their original index
+    '''
+
+    def setUp(self):
+        self.df = make_df()
+
+    def test_no_filters(self):
+        self.assertTrue(build_filter_mask(self.df).all())
+        pd.testing.assert_frame_equal(filter_dataframe(self.df), self.df)
+
+    def test_categorical_selection(self):
+        mask = build_filter_mask(self.df, selections={'name': ['a', 'c', 'missing']})
+        np.testing.assert_array_equal(mask, self.df['name'].isin(['a', 'c']).to_numpy())
+
+    def test_every_category_excludes_missing(self):
+        mask = build_filter_mask(self.df, selections={'name': ['a', 'b', 'c']})
+        np.testing.assert_array_equal(mask, self.df['name'].notna().to_numpy())
+
+    def test_text_selection(self):
+        mask = build_filter_mask(self.df, selections={'label': ['x']})
+        np.testing.assert_array_equal(mask, (self.df['label'] == 'x').to_numpy())
+
+    def test_range(self):
+        mask = build_filter_mask(self.df, ranges={'value': (2, 5)})
+        np.testing.assert_array_equal(mask, self.df['value'].between(2, 5).to_numpy())
+
+    def test_combined_filters(self):
+        selections = {'name': ['a', 'b'], 'label': ['x', 'y']}
+        ranges = {'value': (0, 5)}
+        expected = self.df[self.df['name'].isin(['a', 'b'])
+                           & self.df['label'].isin(['x', 'y'])
+                           & self.df['value'].between(0, 5)]
+
+        pd.testing.assert_frame_equal(filter_dataframe(self.df, selections, ranges), expected)
+
+
+class TestSortedWindow(unittest.TestCase):
+    '''
+    Tests cover:
+    - a range on the registered frame's sorted_by column is found by binary search
+      and matches the unsorted result, including integer columns searched with floats
+    - frames re-sorted after inheriting sorted_by compare every row
+    - a range with low > high selects no rows
+    '''
+
+    @classmethod
+    def setUpClass(cls):
+        server = Flask(__name__)
+        cache.init_app(server, config={'CACHE_TYPE': 'SimpleCache'})
+
+        rng = np.random.default_rng(0)
+        cls.df = pd.DataFrame({
+            'value': np.sort(rng.integers(0, 100, 200)).astype('int16'),
+            'group': rng.choice(['a', 'b'], 200),
+        })
+        cls.df.attrs['sorted_by'] = 'value'
+
+        with server.app_context():
+            register_dataframe(cls.df)
+
+    def test_sorted_range(self):
+        self.assertEqual(get_column_stats(self.df)['sorted_by'], 'value')
+
+        for low, high in [(20, 40), (20.5, 39.5), (-1000, 10), (50, 1e6), (200, 300)]:
+            with self.subTest(low=low, high=high):
+                window, _ = _filter_window(self.df, ranges={'value': (low, high)})
+                self.assertLess(window.stop - window.start, len(self.df))
+
+                mask = build_filter_mask(self.df, {'group': ['a']}, {'value': (low, high)})
+                expected = self.df['group'].eq('a') & self.df['value'].between(low, high)
+                np.testing.assert_array_equal(mask, expected.to_numpy())
+
+    def test_resorted_frame(self):
+        resorted = self.df.sort_values('group')
+        self.assertEqual(resorted.attrs['sorted_by'], 'value')
+
+        window, _ = _filter_window(resorted, ranges={'value': (20, 40)})
+        self.assertEqual(window, slice(0, len(resorted)))
+
+        filtered = filter_dataframe(resorted, ranges={'value': (20, 40)})
+        pd.testing.assert_frame_equal(filtered, resorted[resorted['value'].between(20, 40)])
+
+    def test_reversed_range(self):
+        self.assertFalse(build_filter_mask(self.df, ranges={'value': (60, 40)}).any())
+        self.assertTrue(filter_dataframe(self.df, ranges={'value': (60, 40)}).empty)
+
+
+class TestRegisteredStats(unittest.TestCase):
+    '''
+    Tests cover:
+    - the registered DataFrame gets column statistics, derived frames do not
+    - filters and column_max on derived frames use their own values
+    '''
+
+    @classmethod
+    def setUpClass(cls):
+        server = Flask(__name__)
+        cache.init_app(server, config={'CACHE_TYPE': 'SimpleCache'})
+
+        cls.df = pd.DataFrame({'v': [0.0, 1.0, 2.0, 3.0, 4.0]})
+
+        with server.app_context():
+            register_dataframe(cls.df)
+
+    def test_registered_stats(self):
+        stats = get_column_stats(self.df)
+        self.assertEqual(stats['column_max'], {'v': 4.0})
+        self.assertEqual(column_max(self.df, 'v'), 4.0)
+
+        # A range spanning the whole column keeps every row
+        self.assertTrue(build_filter_mask(self.df, ranges={'v': (0, 5)}).all())
+
+    def test_derived_frame(self):
+        derived = self.df.assign(v=self.df['v'] * 10)
+        self.assertIsNone(get_column_stats(derived))
+        self.assertEqual(column_max(derived, 'v'), 40.0)
+
+        filtered = filter_dataframe(derived, ranges={'v': (0, 5)})
+        pd.testing.assert_frame_equal(filtered, derived[derived['v'].between(0, 5)])
+
+
+if __name__ == '__main__':
+    unittest.main()
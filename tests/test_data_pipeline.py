@@ -0,0 +1,302 @@
+'''
+Tests for DataPipeline, including the vectorised validation path checked
+against the row by row pydantic path it replaces.
+'''
+
+import os
+import re
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+from pydantic import BaseModel, ConfigDict, Field
+
+from models.model import Data
+from pipeline.data_pipeline import (DataPipeline, _NotVectorisable, _validate_record_batch,
+                                    _vectorised_field_types)
+
+
+def error_fields(df_errors: pd.DataFrame) -> list[list[str]]:
+    '''Field names listed in each failing row's error details.'''
+    if df_errors.empty:
+        return []
+    return [re.findall(r'^\d+\) (\w+):', details, re.M) for details in df_errors['error_details']]
+
+
+class TestValidateColumns(unittest.TestCase):
+    '''
+    Tests cover:
+    - _validate_columns keeps and rejects the same rows as _validate_records
+    - inputs the vectorised path cannot check exactly are left to pydantic
+    - models with non-default config skip the vectorised path
+    '''
+
+    def setUp(self):
+        self.pipeline = DataPipeline('data.xlsx')
+
+    def assert_paths_match(self, data: dict):
+        '''Validates data with both paths and checks the results agree.'''
+        df = pd.DataFrame(data)
+        field_types = _vectorised_field_types(Data, df.columns)
+        self.assertIsNotNone(field_types)
+
+        columns_valid, columns_errors = self.pipeline._validate_columns(df, field_types)
+        records_valid, records_errors = self.pipeline._validate_records(df)
+
+        pd.testing.assert_frame_equal(columns_valid, records_valid)
+        self.assertEqual(error_fields(columns_errors), error_fields(records_errors))
+        self.assertEqual(columns_errors.get('total_errors', pd.Series()).tolist(),
+                         records_errors.get('total_errors', pd.Series()).tolist())
+
+    def test_clean(self):
+        self.assert_paths_match({
+            'var_1': [1, 2, 3],
+            'var_2': [1.5, 2.5, 3.5],
+            'date_var': pd.to_datetime(['2024-01-01', '2024-01-02', '2024-01-03'])})
+
+    def test_coercible(self):
+        self.assert_paths_match({
+            'var_1': ['1', 2.0, ' 3 '],
+            'var_2': ['1.5', 2, 'NaN'],
+            'date_var': ['2024-01-01', '2024-01-02T10:00:00', '2024-01-03 11:30']})
+
+    def test_invalid(self):
+        self.assert_paths_match({
+            'var_1': ['a', 1.5, 3, 4],
+            'var_2': ['x', 2.0, 3.0, 4.0],
+            'date_var': ['not a date', '2024-01-02', '2024-13-01', '2024-01-04']})
+
+    def test_invalid_datetime_shapes(self):
+        # pandas' ISO 8601 parser reads all of these, pydantic rejects them
+        dates = ['2024/01/01', '2024 01 01', '2024.01.01', '2024-1-5', '2024-01-01 10',
+                 '2024-01', '0000-01-01', '2024-01-05']
+
+        self.assert_paths_match({
+            'var_1': list(range(len(dates))),
+            'var_2': [1.0] * len(dates),
+            'date_var': dates})
+
+    def test_missing(self):
+        self.assert_paths_match({
+            'var_1': [1, None, 3, 4],
+            'var_2': [np.nan, 2.0, None, 4.0],
+            'date_var': ['2024-01-01', '2024-01-02', '2024-01-03', None]})
+
+    def test_timezone_aware(self):
+        self.assert_paths_match({
+            'var_1': [1, 2],
+            'var_2': [1.0, 2.0],
+            'date_var': ['2024-01-01T10:00:00+02:00', '2024-01-02T10:00:00+02:00']})
+        self.assert_paths_match({
+            'var_1': [1, 2],
+            'var_2': [1.0, 2.0],
+            'date_var': pd.date_range('2024-01-01', periods=2, tz='Europe/London')})
+
+    def test_not_vectorisable(self):
+        inputs = {
+            'int overflow': {'var_1': [1e20, 2], 'var_2': [1.0, 2.0],
+                             'date_var': ['2024-01-01', '2024-01-02']},
+            'big ints mixed with text': {'var_1': [2 ** 70, 'x'], 'var_2': [1.0, 2.0],
+                                         'date_var': ['2024-01-01', '2024-01-02']},
+            'unix timestamps': {'var_1': [1, 2], 'var_2': [1.0, 2.0],
+                                'date_var': [1_700_000_000, '2024-01-02']},
+            'mixed offsets': {'var_1': [1, 2], 'var_2': [1.0, 2.0],
+                              'date_var': ['2024-01-01T10:00:00+02:00',
+                                           '2024-01-02T10:00:00+03:00']},
+            'pydantic only datetime shape': {'var_1': [1, 2], 'var_2': [1.0, 2.0],
+                                             'date_var': ['2024-01-01t10:00',
+                                                          '2024-01-02T10:00:00,5']},
+        }
+
+        for name, data in inputs.items():
+            with self.subTest(name):
+                df = pd.DataFrame(data)
+                with self.assertRaises(_NotVectorisable):
+                    self.pipeline._validate_columns(df, _vectorised_field_types(Data, df.columns))
+
+                # _validate_inputs falls back to pydantic rather than failing
+                df_validated = self.pipeline._validate_inputs(df)
+                records_valid, _ = self.pipeline._validate_records(df)
+                pd.testing.assert_frame_equal(df_validated, records_valid)
+
+    def test_alias_columns(self):
+        class AliasData(BaseModel):
+            var_1: int = Field(alias='Var 1')
+
+        df = pd.DataFrame({'Var 1': ['1', 'x']})
+        df_validated, df_errors = self.pipeline._validate_columns(
+            df, _vectorised_field_types(AliasData, df.columns))
+
+        # Named by field, as _validate_records names them, while errors keep the input column
+        self.assertEqual(df_validated.columns.tolist(), ['var_1'])
+        self.assertEqual(df_errors.columns.tolist(), ['Var 1', 'total_errors', 'error_details'])
+        self.assertEqual(df_errors['error_details'].tolist(),
+                         ['1) Var 1: Input should be a valid integer'])
+
+    def test_model_config_falls_back(self):
+        class StrictData(BaseModel):
+            model_config = ConfigDict(strict=True)
+            var_1: int
+
+        class ForbidData(BaseModel):
+            model_config = ConfigDict(extra='forbid')
+            var_1: int
+
+        columns = pd.Index(['var_1'])
+
+        self.assertIsNone(_vectorised_field_types(StrictData, columns))
+        self.assertIsNone(_vectorised_field_types(ForbidData, columns))
+        self.assertIsNotNone(_vectorised_field_types(Data, pd.Index(Data.model_fields)))
+
+
+class TestValidateRecordBatch(unittest.TestCase):
+    '''
+    Tests cover:
+    - errors without a field path are reported against '__root__'
+    '''
+
+    def test_model_level_error(self):
+        valid, errors = _validate_record_batch(
+            [{'var_1': 1, 'var_2': 1.0, 'date_var': '2024-01-01'}, 'not a record'])
+
+        self.assertEqual(len(valid), 1)
+        self.assertEqual([field for field, _ in errors[1]], ['__root__'])
+
+
+class TestParallelValidation(unittest.TestCase):
+    '''
+    Tests cover:
+    - validating across worker processes gives the same results as one process,
+      with error rows mapped back to their position in the full input
+    '''
+
+    def test_matches_single_process(self):
+        n_rows = 50
+        var_1 = list(range(n_rows))
+        date_var = ['2024-01-01'] * n_rows
+
+        # Failing rows spread over every worker's chunk, including the chunk edges
+        for row in (0, 12, 13, 26, 38, 49):
+            var_1[row] = 'x'
+        for row in (13, 40):
+            date_var[row] = 'not a date'
+
+        df = pd.DataFrame({'var_1': var_1, 'var_2': [1.0] * n_rows, 'date_var': date_var})
+
+        single_valid, single_errors = DataPipeline('data.xlsx')._validate_records(df)
+        parallel_valid, parallel_errors = DataPipeline('data.xlsx', n_workers=4)._validate_records(df)
+
+        pd.testing.assert_frame_equal(parallel_valid, single_valid)
+        pd.testing.assert_frame_equal(parallel_errors, single_errors)
+        self.assertEqual(single_errors['var_1'].eq('x').sum(), 6)
+
+
+class TestReadExcel(unittest.TestCase):
+    '''
+    Tests cover:
+    - the Parquet cache is read instead of the Excel file while the source is unchanged
+    - a changed source modification time rebuilds the cache
+    - data Parquet cannot store is still returned, without a cache file
+    - a user's own <stem>.parquet next to the source is left untouched
+    '''
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+        self.source = os.path.join(self.tmp_dir.name, 'data.xlsx')
+        self.cache_file = self.source + '.cache.parquet'
+
+    def make_pipeline(self, df: pd.DataFrame) -> DataPipeline:
+        '''Writes df as the Excel source and returns a pipeline reading it.'''
+        df.to_excel(self.source, index=False)
+        return DataPipeline('data.xlsx', input_dir_path=self.tmp_dir.name, excel_params={})
+
+    def test_cache_hit(self):
+        df = pd.DataFrame({'var_1': [1, 2], 'var_2': [1.5, 2.5]})
+        pipeline = self.make_pipeline(df)
+
+        pd.testing.assert_frame_equal(pipeline._read_excel(), df)
+        self.assertTrue(os.path.exists(self.cache_file))
+
+        with mock.patch('pandas.read_excel', side_effect=AssertionError('read Excel again')):
+            cached = pipeline._read_excel()
+
+        pd.testing.assert_frame_equal(cached, df)
+        self.assertEqual(cached.attrs, {})
+
+    def test_source_changed(self):
+        pipeline = self.make_pipeline(pd.DataFrame({'var_1': [1, 2]}))
+        pipeline._read_excel()
+        mtime_ns = os.stat(self.source).st_mtime_ns
+
+        updated = pd.DataFrame({'var_1': [3, 4, 5]})
+        updated.to_excel(self.source, index=False)
+        os.utime(self.source, ns=(mtime_ns + 10 ** 9, mtime_ns + 10 ** 9))
+
+        pd.testing.assert_frame_equal(pipeline._read_excel(), updated)
+
+        # The rebuilt cache is used from then on
+        with mock.patch('pandas.read_excel', side_effect=AssertionError('read Excel again')):
+            pd.testing.assert_frame_equal(pipeline._read_excel(), updated)
+
+    def test_unstorable_column(self):
+        # Mixing numbers and text in one column has no Arrow type
+        df = pd.DataFrame({'var_1': [1, 'two', 3]})
+        pipeline = self.make_pipeline(df)
+
+        pd.testing.assert_frame_equal(pipeline._read_excel(), df)
+        self.assertFalse(os.path.exists(self.cache_file))
+
+    def test_existing_parquet_untouched(self):
+        own_file = os.path.join(self.tmp_dir.name, 'data.parquet')
+        own = pd.DataFrame({'other': ['kept']})
+        own.to_parquet(own_file)
+
+        pipeline = self.make_pipeline(pd.DataFrame({'var_1': [1, 2]}))
+        pipeline._read_excel()
+
+        pd.testing.assert_frame_equal(pd.read_parquet(own_file), own)
+
+
+class TestExportData(unittest.TestCase):
+    '''
+    Tests cover:
+    - validated timezone-aware datetimes export to Excel as naive UTC
+    '''
+
+    def setUp(self):
+        # export_data writes relative to the working directory
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(self.tmp_dir.name)
+
+    def export_and_read(self, dates: list) -> pd.Series:
+        '''Validates rows with the given dates, exports them and reads back date_var.'''
+        pipeline = DataPipeline('data.xlsx')
+        pipeline._validate_inputs(pd.DataFrame({
+            'var_1': list(range(len(dates))),
+            'var_2': [1.0] * len(dates),
+            'date_var': dates}))
+
+        pipeline.export_data('out.xlsx', export_validated=True)
+
+        exported = pd.read_excel(os.path.join('reporting', 'out.xlsx'), sheet_name='Validated Data')
+        return exported['date_var']
+
+    def test_timezone_aware(self):
+        exported = self.export_and_read(['2024-01-01T10:00:00+02:00', '2024-01-02T10:00:00+02:00'])
+        self.assertEqual(exported.tolist(), [pd.Timestamp('2024-01-01 08:00'),
+                                             pd.Timestamp('2024-01-02 08:00')])
+
+    def test_mixed_offsets(self):
+        exported = self.export_and_read(['2024-01-01T10:00:00+02:00', '2024-01-02T10:00:00+03:00'])
+        self.assertEqual(exported.tolist(), [pd.Timestamp('2024-01-01 08:00'),
+                                             pd.Timestamp('2024-01-02 07:00')])
+
+
+if __name__ == '__main__':
+    unittest.main()